@@ -5,29 +5,214 @@ Run this script, then open http://localhost:8000 in your browser
 
 Usage:
     python dashboard_server.py
+
+Uses aiohttp (asyncio, single thread) when it's installed, otherwise the
+standard library's threaded http.server.
 """
 
+import asyncio
+import gzip
 import http.server
-import socketserver
+import io
+import mimetypes
 import os
 import webbrowser
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from aiohttp import web  # Optional: asyncio server for many concurrent pollers
+except ImportError:
+    web = None
+
 PORT = 8000
 
+# Text assets worth compressing when the browser accepts gzip
+GZIP_EXTENSIONS = ('.json', '.html', '.js', '.css')
+
+@lru_cache(maxsize=16)
+def gzipped_file(path, mtime_ns):
+    """Gzip a file's contents, cached until the file's mtime changes.
+    
+    A pre-compressed sibling (e.g. portfolio_data.json.gz written by the
+    backend) is used as-is when it's at least as new as the file.
+    """
+    try:
+        if os.stat(path + '.gz').st_mtime_ns >= mtime_ns:
+            with open(path + '.gz', 'rb') as f:
+                return f.read()
+    except FileNotFoundError:
+        pass
+    with open(path, 'rb') as f:
+        return gzip.compress(f.read(), compresslevel=6)
+
+def file_etag(st, gzipped):
+    """Strong ETag from a file's stat; gzip bodies get their own tag."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-gz" if gzipped else ""}"'
+
+def accepts_gzip(accept_encoding):
+    """True if an Accept-Encoding header allows gzip (q=0 means refused)."""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted.get('gzip', accepted.get('*', 0.0)) > 0
+
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Keep-alive lets the browser reuse one connection for HTML + JSON
+    protocol_version = "HTTP/1.1"
+
     def end_headers(self):
         # Add CORS headers to allow local file access
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-        self.send_header('Expires', '0')
+        if getattr(self, 'vary_encoding', False):
+            self.send_header('Vary', 'Accept-Encoding')
+        if getattr(self, 'etag', None):
+            # Browser may keep the body but must revalidate with If-None-Match
+            self.send_header('ETag', self.etag)
+            self.send_header('Cache-Control', 'no-cache')
+        else:
+            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+            self.send_header('Expires', '0')
         super().end_headers()
 
+    def send_head(self):
+        self.etag = None
+        self.vary_encoding = False
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        st = os.stat(path)
+        self.vary_encoding = path.endswith(GZIP_EXTENSIONS)
+        use_gzip = self.vary_encoding and accepts_gzip(self.headers.get('Accept-Encoding', ''))
+
+        # JSON data is polled by the dashboard - answer 304 when unchanged
+        if path.endswith('.json'):
+            self.etag = file_etag(st, use_gzip)
+            if self.headers.get('If-None-Match') == self.etag:
+                self.send_response(304)
+                self.end_headers()
+                return None
+
+        if not use_gzip:
+            return super().send_head()
+
+        body = gzipped_file(path, st.st_mtime_ns)
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def copyfile(self, source, outputfile):
+        # Hand real files to the kernel (os.sendfile via socket.sendfile)
+        # instead of copying through Python buffers. In-memory bodies such
+        # as directory listings have no fileno and take the normal path.
+        try:
+            source.fileno()
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+        if outputfile is not self.wfile:
+            return super().copyfile(source, outputfile)
+        outputfile.flush()
+        self.connection.sendfile(source)
+
     def log_message(self, format, *args):
         # Cleaner log format
         if args[0].startswith('GET'):
             print(f"✅ Served: {args[0]}")
 
+class DashboardHTTPServer(http.server.ThreadingHTTPServer):
+    # Serve requests concurrently so a slow JSON fetch doesn't block the page
+    allow_reuse_address = True  # Avoid "address already in use" on restart
+    daemon_threads = True  # Let Ctrl+C exit without waiting on open connections
+
+if web is not None:
+    @web.middleware
+    async def dashboard_headers(request, handler):
+        # Same CORS/caching policy as MyHTTPRequestHandler. Compression is
+        # left to serve_text: enable_compression() would make FileResponse
+        # skip sendfile and re-deflate every request.
+        response = await handler(request)
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        if request.path.endswith('.json'):
+            response.headers['Cache-Control'] = 'no-cache'
+        else:
+            response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate'
+            response.headers['Expires'] = '0'
+        if request.path.endswith(GZIP_EXTENSIONS):
+            response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+    async def serve_text(request):
+        # FileResponse picks a .gz sibling by substring match on Accept-Encoding
+        # (ignoring q-values) and never checks its age, so choose the encoding
+        # here with the same rules as MyHTTPRequestHandler
+        path = os.path.realpath(request.match_info['name'])
+        if os.path.commonpath([path, os.getcwd()]) != os.getcwd() or not os.path.isfile(path):
+            raise web.HTTPNotFound()
+        
+        st = os.stat(path)
+        use_gzip = accepts_gzip(request.headers.get('Accept-Encoding', ''))
+        etag = file_etag(st, use_gzip)
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        
+        if use_gzip:
+            body = gzipped_file(path, st.st_mtime_ns)
+        elif not os.path.exists(path + '.gz'):
+            return web.FileResponse(path)  # Nothing it could mix up - keep sendfile
+        else:
+            body = Path(path).read_bytes()
+        response = web.Response(body=body, content_type=mimetypes.guess_type(path)[0],
+                                headers={'ETag': etag})
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.last_modified = st.st_mtime
+        return response
+
+async def serve_aiohttp(url):
+    """Serve the current directory with aiohttp until interrupted."""
+    app = web.Application(middlewares=[dashboard_headers])
+    # Text assets get the same gzip handling as the threaded server
+    extensions = '|'.join(ext.lstrip('.') for ext in GZIP_EXTENSIONS)
+    app.router.add_get(rf'/{{name:.+\.(?:{extensions})}}', serve_text)
+    app.router.add_static('/', '.', show_index=False)
+    
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=PORT).start()
+    announce_and_open(url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+def announce_and_open(url):
+    """Print the startup banner and open the dashboard in a browser."""
+    print(f"\n🌐 Server running at: {url}")
+    print("\n📊 Opening dashboard in your browser...")
+    print("\n💡 Press Ctrl+C to stop the server")
+    print("="*70 + "\n")
+    
+    # Open browser
+    try:
+        webbrowser.open(url)
+    except:
+        print("Could not open browser automatically. Please open manually:")
+        print(f"   {url}")
+
 def main():
     # Change to script directory
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -50,22 +235,20 @@ def main():
     else:
         print("\n✅ Found portfolio_data.json")
     
+    url = f"http://localhost:{PORT}/dashboard.html"
+    
     # Start server
+    if web is not None:
+        try:
+            asyncio.run(serve_aiohttp(url))
+        except KeyboardInterrupt:
+            print("\n\n👋 Server stopped. Goodbye!")
+        return
+    
     Handler = MyHTTPRequestHandler
     
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
-        url = f"http://localhost:{PORT}/dashboard.html"
-        print(f"\n🌐 Server running at: {url}")
-        print("\n📊 Opening dashboard in your browser...")
-        print("\n💡 Press Ctrl+C to stop the server")
-        print("="*70 + "\n")
-        
-        # Open browser
-        try:
-            webbrowser.open(url)
-        except:
-            print("Could not open browser automatically. Please open manually:")
-            print(f"   {url}")
+    with DashboardHTTPServer(("", PORT), Handler) as httpd:
+        announce_and_open(url)
         
         # Serve forever
         try:
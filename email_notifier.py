@@ -3,12 +3,135 @@ Email Notification System for Paper Trading
 Sends daily portfolio updates via email
 """
 
+import hashlib
+import heapq
+import operator
 import smtplib
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from functools import lru_cache
 import json
+import os
 from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+try:
+    import orjson  # Optional: much faster JSON parse/serialize
+except ImportError:
+    orjson = None
+
+
+def read_json(path):
+    """Parse a JSON file with orjson when it's installed, else the stdlib json.
+
+    orjson rejects the NaN/Infinity literals the stdlib json writes, so such
+    files fall back to json.loads.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=8)
+def _load_json_cached(path, mtime):
+    """Parse a JSON file, memoized on (path, mtime) so edits invalidate the cache.
+
+    Callers only read the returned dict - don't mutate it.
+    """
+    return read_json(path)
+
+
+def load_json(path):
+    """Load a JSON file, reusing the parsed result if it hasn't changed on disk."""
+    path = os.fspath(path)
+    return _load_json_cached(path, os.path.getmtime(path))
+
+
+def dump_json(data, path):
+    """Write data as indented JSON, using orjson when it's installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+# Static stylesheet for the report email - built once at import time
+_REPORT_CSS = """<style>
+    body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+    .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+              color: white; padding: 20px; border-radius: 10px; }
+    .metric { background: #f7fafc; padding: 15px; margin: 10px 0;
+             border-left: 4px solid #667eea; border-radius: 5px; }
+    .positive { color: #48bb78; font-weight: bold; }
+    .negative { color: #f56565; font-weight: bold; }
+    .trade { background: #fff3cd; padding: 10px; margin: 5px 0;
+             border-left: 4px solid #ffc107; border-radius: 5px; }
+    table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+    th { background: #667eea; color: white; padding: 12px; text-align: left; }
+    td { padding: 10px; border-bottom: 1px solid #e2e8f0; }
+    tr:hover { background: #f7fafc; }
+    .footer { margin-top: 30px; padding-top: 20px; border-top: 1px solid #e2e8f0;
+              color: #718096; font-size: 12px; text-align: center; }
+</style>"""
+
+# Static document head/footer; only the banner timestamp changes per report
+_REPORT_HEAD = """
+        <html>
+        <head>
+            """ + _REPORT_CSS + """
+        </head>
+        <body>"""
+
+_REPORT_BANNER_TMPL = """
+            <div class="header">
+                <h1>📊 Paper Trading Daily Update</h1>
+                <p>{timestamp}</p>
+            </div>
+            """
+
+_REPORT_FOOTER = """
+            <div class="footer">
+                <p>🔴 This is a paper trading account - No real money involved</p>
+                <p>Dashboard: <a href="http://localhost:8000/dashboard.html">View Live Dashboard</a></p>
+            </div>
+        </body>
+        </html>
+        """
+
+# Table row templates - compiled once, filled per position with str.format
+_NEW_POS_ROW_TMPL = """
+                <tr>
+                    <td><strong>{ticker}</strong></td>
+                    <td>{action}</td>
+                    <td>${strike:.0f}</td>
+                    <td>{contracts}</td>
+                    <td class="positive">${pnl:,.2f}</td>
+                    <td>{expiration}</td>
+                </tr>
+                """
+
+# Filled positionally from the (ticker, strike, contracts, premium,
+# expiration, days_held) rows built in format_portfolio_report
+_OPEN_POS_ROW_TMPL = """
+                <tr>
+                    <td><strong>{0}</strong></td>
+                    <td>${1:.0f}</td>
+                    <td>{2}</td>
+                    <td>${3:.2f}</td>
+                    <td>{4}</td>
+                    <td>{5}</td>
+                </tr>
+                """
+
 
 class EmailNotifier:
     """Handles sending email notifications about portfolio updates."""
@@ -27,6 +150,9 @@ class EmailNotifier:
         # Load preferences
         self.preferences = self.config.get('email_preferences', {})
         
+        # Digest of the last report sent, used to skip duplicate sends on retries
+        self.last_email_file = Path(self.config_file).with_name('.last_email.sha256')
+        
     def load_config(self):
         """Load email configuration from JSON file."""
         if not Path(self.config_file).exists():
@@ -49,12 +175,10 @@ class EmailNotifier:
                     "timezone": "America/Chicago"
                 }
             }
-            with open(self.config_file, 'w') as f:
-                json.dump(default_config, f, indent=2)
+            dump_json(default_config, self.config_file)
             return default_config
         
-        with open(self.config_file, 'r') as f:
-            return json.load(f)
+        return load_json(self.config_file)
         
     def load_recipients(self):
         """Load email recipients from config file."""
@@ -66,15 +190,30 @@ class EmailNotifier:
         
         return recipients
     
-    def format_portfolio_report(self, portfolio_data, trades_executed):
+    def report_timestamp(self):
+        """Current time in the configured timezone, formatted for the report banner."""
+        try:
+            tz = ZoneInfo(self.preferences.get('timezone', 'America/Chicago'))
+        except (ZoneInfoNotFoundError, ValueError):
+            # No tz database (e.g. Windows without tzdata) - fall back to local time
+            return datetime.now().strftime('%B %d, %Y at %I:%M %p CT')
+        return datetime.now(tz).strftime('%B %d, %Y at %I:%M %p %Z')
+    
+    @staticmethod
+    def headline_metrics(portfolio_data):
+        """Return (latest portfolio value, total return %) for report and subject line."""
+        initial = portfolio_data['initial_capital']
+        portfolio_value = portfolio_data['daily_snapshots'][-1]['portfolio_value']
+        return portfolio_value, (portfolio_value - initial) / initial * 100
+    
+    def format_portfolio_report(self, portfolio_data, trades_executed, timestamp=None):
         """Generate HTML email report from portfolio data."""
         
-        latest = portfolio_data['daily_snapshots'][-1]
-        initial = portfolio_data['initial_capital']
+        if timestamp is None:
+            timestamp = self.report_timestamp()
         
         # Calculate metrics
-        portfolio_value = latest['portfolio_value']
-        total_return = ((portfolio_value - initial) / initial * 100)
+        portfolio_value, total_return = self.headline_metrics(portfolio_data)
         cash = portfolio_data['current_cash']
         
         # Positions
@@ -87,34 +226,13 @@ class EmailNotifier:
         # Stats
         stats = portfolio_data.get('performance_stats', {})
         
-        # Build HTML
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                          color: white; padding: 20px; border-radius: 10px; }}
-                .metric {{ background: #f7fafc; padding: 15px; margin: 10px 0; 
-                         border-left: 4px solid #667eea; border-radius: 5px; }}
-                .positive {{ color: #48bb78; font-weight: bold; }}
-                .negative {{ color: #f56565; font-weight: bold; }}
-                .trade {{ background: #fff3cd; padding: 10px; margin: 5px 0; 
-                         border-left: 4px solid #ffc107; border-radius: 5px; }}
-                table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-                th {{ background: #667eea; color: white; padding: 12px; text-align: left; }}
-                td {{ padding: 10px; border-bottom: 1px solid #e2e8f0; }}
-                tr:hover {{ background: #f7fafc; }}
-                .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #e2e8f0;
-                          color: #718096; font-size: 12px; text-align: center; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>📊 Paper Trading Daily Update</h1>
-                <p>{datetime.now().strftime('%B %d, %Y at %I:%M %p CT')}</p>
-            </div>
-            
+        # Build HTML - collect fragments and join once at the end
+        parts = []
+        parts.append(_REPORT_HEAD)
+        parts.append(_REPORT_BANNER_TMPL.format(
+            timestamp=timestamp
+        ))
+        parts.append(f"""
             <h2>Portfolio Summary</h2>
             <div class="metric">
                 <strong>Portfolio Value:</strong> ${portfolio_value:,.2f} 
@@ -135,67 +253,61 @@ class EmailNotifier:
                 <strong>Open Positions:</strong> {len(positions)} 
                 | <strong>Closed Trades:</strong> {len(closed)}
             </div>
-        """
+        """)
         
         # Trades executed today
         if trades_executed > 0:
-            html += f"""
+            parts.append(f"""
             <h2>🎯 Today's Activity</h2>
             <div class="trade">
                 <strong>✅ {trades_executed} new trade(s) executed today!</strong>
             </div>
-            """
+            """)
             
             # Show newest positions
-            newest_positions = sorted(positions, key=lambda x: x['entry_date'], reverse=True)[:trades_executed]
-            html += "<table>"
-            html += "<tr><th>Ticker</th><th>Action</th><th>Strike</th><th>Contracts</th><th>Premium</th><th>Expiration</th></tr>"
+            newest_positions = heapq.nlargest(trades_executed, positions, key=operator.itemgetter('entry_date'))
+            parts.append("<table>")
+            parts.append("<tr><th>Ticker</th><th>Action</th><th>Strike</th><th>Contracts</th><th>Premium</th><th>Expiration</th></tr>")
             for pos in newest_positions:
                 pnl = pos.get('premium_collected', 0) if pos['action'] == 'SELL' else -pos.get('premium_paid', 0)
-                html += f"""
-                <tr>
-                    <td><strong>{pos['ticker']}</strong></td>
-                    <td>{pos['action']}</td>
-                    <td>${pos['strike']:.0f}</td>
-                    <td>{pos['contracts']}</td>
-                    <td class="positive">${pnl:,.2f}</td>
-                    <td>{pos['expiration']}</td>
-                </tr>
-                """
-            html += "</table>"
+                parts.append(_NEW_POS_ROW_TMPL.format(
+                    ticker=pos['ticker'],
+                    action=pos['action'],
+                    strike=pos['strike'],
+                    contracts=pos['contracts'],
+                    pnl=pnl,
+                    expiration=pos['expiration']
+                ))
+            parts.append("</table>")
         else:
-            html += f"""
+            parts.append(f"""
             <h2>Today's Activity</h2>
             <div class="trade">
                 <strong>⏸️  No new trades today</strong>
                 <p>Strategy conditions not met or maximum positions reached.</p>
             </div>
-            """
+            """)
         
         # Open positions
         if len(positions) > 0:
-            html += "<h2>Open Positions</h2>"
-            html += "<table>"
-            html += "<tr><th>Ticker</th><th>Strike</th><th>Contracts</th><th>Premium</th><th>Expiration</th><th>Days Held</th></tr>"
+            parts.append("<h2>Open Positions</h2>")
+            parts.append("<table>")
+            parts.append("<tr><th>Ticker</th><th>Strike</th><th>Contracts</th><th>Premium</th><th>Expiration</th><th>Days Held</th></tr>")
             
-            for pos in positions:
-                premium = pos.get('premium_collected', 0) if pos['action'] == 'SELL' else pos.get('premium_paid', 0)
-                html += f"""
-                <tr>
-                    <td><strong>{pos['ticker']}</strong></td>
-                    <td>${pos['strike']:.0f}</td>
-                    <td>{pos['contracts']}</td>
-                    <td>${premium:.2f}</td>
-                    <td>{pos['expiration']}</td>
-                    <td>{pos.get('days_held', 0)}</td>
-                </tr>
-                """
-            html += "</table>"
+            # One pass over each position dict, then a tight tuple -> format loop
+            rows = [
+                (p['ticker'], p['strike'], p['contracts'],
+                 p.get('premium_collected', 0) if p['action'] == 'SELL' else p.get('premium_paid', 0),
+                 p['expiration'], p.get('days_held', 0))
+                for p in positions
+            ]
+            parts.extend(_OPEN_POS_ROW_TMPL.format(*row) for row in rows)
+            parts.append("</table>")
         
         # Performance stats
         if stats.get('total_trades', 0) > 0:
             win_rate = (stats['winning_trades'] / stats['total_trades'] * 100)
-            html += f"""
+            parts.append(f"""
             <h2>Performance Statistics</h2>
             <div class="metric">
                 <strong>Total Closed Trades:</strong> {stats['total_trades']}<br>
@@ -208,22 +320,35 @@ class EmailNotifier:
                 <strong>Largest Win:</strong> ${stats['largest_win']:,.2f}<br>
                 <strong>Largest Loss:</strong> ${stats['largest_loss']:,.2f}
             </div>
-            """
+            """)
         
         # Footer
-        html += """
-            <div class="footer">
-                <p>🔴 This is a paper trading account - No real money involved</p>
-                <p>Dashboard: <a href="http://localhost:8000/dashboard.html">View Live Dashboard</a></p>
-            </div>
-        </body>
-        </html>
-        """
+        parts.append(_REPORT_FOOTER)
         
-        return html
+        return ''.join(parts)
+    
+    @contextmanager
+    def smtp_session(self):
+        """Open one authenticated SMTP connection that can serve several sends.
+
+        Usage:
+            with notifier.smtp_session() as server:
+                notifier.send_email(subject_a, html_a, server=server)
+                notifier.send_email(subject_b, html_b, server=server)
+        """
+        print(f"📤 Connecting to {self.smtp_server}...")
+        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            server.starttls()
+            print(f"🔐 Logging in...")
+            server.login(self.sender_email, self.sender_password)
+            yield server
     
-    def send_email(self, subject, html_content, recipients=None):
-        """Send email notification."""
+    def send_email(self, subject, html_content, recipients=None, server=None):
+        """Send email notification.
+        
+        Pass an open connection from smtp_session() as `server` to skip the
+        connect/STARTTLS/login round trips; otherwise a one-shot session is used.
+        """
         
         if recipients is None:
             recipients = self.load_recipients()
@@ -238,7 +363,8 @@ class EmailNotifier:
             # Create message
             msg = MIMEMultipart('alternative')
             msg['From'] = self.sender_email
-            msg['To'] = ', '.join(recipients)
+            # Recipients go in the SMTP envelope only (BCC) - one message, server fans out
+            msg['To'] = self.sender_email
             msg['Subject'] = subject
             
             # Attach HTML
@@ -246,13 +372,13 @@ class EmailNotifier:
             msg.attach(html_part)
             
             # Send email
-            print(f"📤 Connecting to {self.smtp_server}...")
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                print(f"🔐 Logging in...")
-                server.login(self.sender_email, self.sender_password)
+            if server is None:
+                with self.smtp_session() as session:
+                    print(f"✉️  Sending email...")
+                    session.send_message(msg, from_addr=self.sender_email, to_addrs=recipients)
+            else:
                 print(f"✉️  Sending email...")
-                server.send_message(msg)
+                server.send_message(msg, from_addr=self.sender_email, to_addrs=recipients)
             
             print(f"✅ Email sent successfully to: {', '.join(recipients)}")
             return True
@@ -275,24 +401,36 @@ class EmailNotifier:
             print(f"❌ Portfolio file not found: {portfolio_file}")
             return False
         
-        with open(portfolio_file, 'r') as f:
-            portfolio_data = json.load(f)
+        portfolio_data = load_json(portfolio_file)
         
         # Generate report
-        html_content = self.format_portfolio_report(portfolio_data, trades_executed)
+        timestamp = self.report_timestamp()
+        html_content = self.format_portfolio_report(portfolio_data, trades_executed, timestamp)
         
         # Create subject
-        latest = portfolio_data['daily_snapshots'][-1]
-        portfolio_value = latest['portfolio_value']
-        total_return = ((portfolio_value - portfolio_data['initial_capital']) / portfolio_data['initial_capital'] * 100)
+        portfolio_value, total_return = self.headline_metrics(portfolio_data)
         
         subject = f"📊 Paper Trading Update - ${portfolio_value:,.0f} ({total_return:+.1f}%)"
         
         if trades_executed > 0:
             subject += f" - {trades_executed} New Trade{'s' if trades_executed != 1 else ''}"
         
+        # Skip if this exact report already went to these recipients (scheduler
+        # retry, manual re-run). The send time is left out of the digest so a
+        # retry still matches; a changed recipient list sends again.
+        recipients = '\n'.join(self.load_recipients())
+        digest = hashlib.sha256(
+            (recipients + subject + html_content.replace(timestamp, '')).encode()
+        ).hexdigest()
+        if self.last_email_file.exists() and self.last_email_file.read_text().strip() == digest:
+            print("⏭️  No change since last email; skipping send")
+            return True
+        
         # Send email
-        return self.send_email(subject, html_content)
+        success = self.send_email(subject, html_content)
+        if success:
+            self.last_email_file.write_text(digest)
+        return success
 
 
 def test_email():
@@ -10,44 +10,98 @@ To run daily: Set up a cron job or Task Scheduler to run this at 9:35 AM ET
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+from scipy.special import ndtr
 import yfinance as yf
 from datetime import datetime, timedelta
+import gzip
 import json
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from email_notifier import read_json  # Shared orjson/stdlib loader
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import orjson  # Optional: C-level JSON, much faster saves/loads
+except ImportError:
+    orjson = None
+
+def _write_atomic(path, data):
+    """Write bytes to path via a temp file and os.replace (no partial files)."""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
 # =============================================================================
 # BLACK-SCHOLES AND OPTIONS PRICING
 # =============================================================================
 
 def black_scholes(S, K, T, r, sigma, option_type='call'):
-    """Calculate Black-Scholes option price."""
-    if T <= 0 or sigma <= 0:
-        return max(S - K, 0) if option_type == 'call' else max(K - S, 0)
+    """Calculate Black-Scholes option price.
     
-    try:
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        if option_type == 'call':
-            return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-        else:
-            return K * norm.cdf(-d2) * np.exp(-r * T) - S * norm.cdf(-d1)
-    except:
-        return 0
+    Inputs broadcast like NumPy arrays, so a whole chain of strikes can be
+    priced in one call. Scalar inputs return a scalar.
+    """
+    S, K, T, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, sigma))
+    is_call = np.asarray(option_type) == 'call'
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_T = np.sqrt(T)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+        discounted_K = K * np.exp(-r * T)
+        call = S * ndtr(d1) - discounted_K * ndtr(d2)
+        put = discounted_K * ndtr(-d2) - S * ndtr(-d1)
+    
+    price = np.where(is_call, call, put)
+    
+    # Expired or zero-vol options are worth their intrinsic value
+    intrinsic = np.where(is_call, np.maximum(S - K, 0), np.maximum(K - S, 0))
+    price = np.where((T <= 0) | (sigma <= 0), intrinsic, price)
+    
+    return price[()]
+
+@lru_cache(maxsize=64)
+def _get_history(ticker, period):
+    """Fetch daily closes for a ticker, cached for the rest of the run."""
+    close = yf.Ticker(ticker).history(period=period)['Close'].to_numpy()
+    close.flags.writeable = False  # Shared between callers via the cache
+    return close
+
+def _fetch_all(tickers, period):
+    """Fetch close history for every ticker concurrently and warm the cache.
+    
+    Returns {ticker: closes}; tickers that fail to download are left out and
+    will be retried (and reported) by the normal per-ticker path.
+    """
+    closes = {}
+    with ThreadPoolExecutor(max_workers=len(tickers)) as pool:
+        futures = {pool.submit(_get_history, t, period): t for t in tickers}
+        for future in as_completed(futures):
+            try:
+                closes[futures[future]] = future.result()
+            except Exception as e:
+                print(f"  ⚠️  Could not prefetch {futures[future]} history: {str(e)}")
+    return closes
+
+@lru_cache(maxsize=256)
+def _parse_date(value):
+    """Parse a stored 'YYYY-MM-DD' date once; datetime.fromisoformat is C-fast."""
+    return datetime.fromisoformat(value)
 
 def calculate_historical_vol(ticker, window=30):
     """Calculate historical volatility for a ticker."""
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period=f'{window + 10}d')
-    returns = hist['Close'].pct_change().dropna()
+    close = _get_history(ticker, f'{window + 10}d')
     
-    if len(returns) < window:
+    if close.size < window + 1:
         return 0.20  # Default
     
-    return returns.iloc[-window:].std() * np.sqrt(252)
+    # Log returns on the raw ndarray - skips pct_change/dropna intermediates
+    log_returns = np.diff(np.log(close[-(window + 1):]))
+    return float(log_returns.std(ddof=1) * np.sqrt(252))
 
 # =============================================================================
 # PORTFOLIO MANAGER
@@ -72,10 +126,13 @@ class PaperTradingPortfolio:
         self.min_moneyness = 1.05  # Min 5% OTM
         self.max_moneyness = 1.15  # Max 15% OTM
         
+        # Spot prices and historical vols fetched this run, keyed by ticker
+        self._price_cache = {}
+        self._hv_cache = {}
+        
         # Load or initialize portfolio
         if os.path.exists(data_file):
-            with open(data_file, 'r') as f:
-                self.portfolio = json.load(f)
+            self.portfolio = read_json(data_file)
             print(f"📂 Loaded existing portfolio from {data_file}")
             print(f"   Current value: ${self.portfolio.get('daily_snapshots', [{'portfolio_value': 1000}])[-1]['portfolio_value']:,.2f}")
             print(f"   Open positions: {len(self.portfolio.get('positions', []))}")
@@ -84,19 +141,45 @@ class PaperTradingPortfolio:
             self.portfolio = self.initialize_portfolio()
             self.save_portfolio()
             print(f"🆕 Created new portfolio")
+        
+        # Older portfolio files may predate performance tracking
+        self.portfolio.setdefault('performance_stats', self._new_performance_stats())
+        self._index_positions()
+    
+    @staticmethod
+    def _new_performance_stats():
+        """Empty performance stats block."""
+        return {
+            'total_trades': 0,
+            'winning_trades': 0,
+            'losing_trades': 0,
+            'total_pnl': 0,
+            'largest_win': 0,
+            'largest_loss': 0
+        }
+    
+    @staticmethod
+    def _position_key(pos):
+        """Identity of a position (or opportunity) for duplicate detection."""
+        return (pos['ticker'], pos['strike'], pos['expiration'], pos['action'])
+    
+    def _index_positions(self):
+        """Rebuild the duplicate-check index and per-ticker counts of open positions."""
+        positions = self.portfolio['positions']
+        self._pos_index = {self._position_key(pos): pos for pos in positions}
+        self._ticker_count = Counter(pos['ticker'] for pos in positions)
     
     def initialize_portfolio(self):
         """Create a new portfolio."""
         today = datetime.now()
         
         # Get initial prices for benchmarks
-        initial_prices = {}
+        try:
+            initial_prices = self._fetch_spots()
+        except Exception:
+            initial_prices = {}
         for ticker in self.tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                initial_prices[ticker] = stock.history(period='1d')['Close'].iloc[-1]
-            except:
-                initial_prices[ticker] = 250  # Fallback
+            initial_prices.setdefault(ticker, 250)  # Fallback
         
         return {
             'start_date': today.strftime('%Y-%m-%d'),
@@ -117,137 +200,198 @@ class PaperTradingPortfolio:
             'benchmark_shares': {
                 ticker: 250 / initial_prices[ticker] for ticker in self.tickers
             },
-            'performance_stats': {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'losing_trades': 0,
-                'total_pnl': 0,
-                'largest_win': 0,
-                'largest_loss': 0
-            }
+            'performance_stats': self._new_performance_stats()
         }
     
     def save_portfolio(self):
-        """Save portfolio to JSON file."""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.portfolio, f, indent=2)
+        """Save portfolio to JSON file (plus a gzipped copy for the dashboard)."""
+        if orjson is not None:
+            # OPT_SERIALIZE_NUMPY: prices and greeks are numpy scalars
+            payload = orjson.dumps(self.portfolio, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            payload = json.dumps(self.portfolio, indent=2).encode()
+        # The dashboard server sends the .gz as-is to browsers that accept
+        # gzip. Remove it before touching the JSON so a stale copy is never
+        # served, then write both via temp file + os.replace so neither is
+        # ever seen (or left by an interrupted run) half-written.
+        gz_file = self.data_file + '.gz'
+        try:
+            os.remove(gz_file)
+        except FileNotFoundError:
+            pass
+        _write_atomic(self.data_file, payload)
+        _write_atomic(gz_file, gzip.compress(payload, compresslevel=6))
         print(f"💾 Portfolio saved to {self.data_file}")
     
+    def _fetch_spots(self):
+        """Fetch latest closes for all uncached tickers in one batched download.
+        
+        Seeds the per-run price cache and returns {ticker: price} for every
+        ticker that has a price. Tickers missing from the download are left
+        for get_current_price to fetch individually.
+        """
+        missing = [t for t in self.tickers if t not in self._price_cache]
+        if missing:
+            data = yf.download(missing, period='1d', group_by='ticker', threads=True, progress=False)
+            for ticker in missing:
+                try:
+                    frame = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+                    closes = frame['Close'].dropna()
+                except KeyError:
+                    continue
+                if len(closes) > 0:
+                    self._price_cache[ticker] = closes.iloc[-1]
+        return {t: self._price_cache[t] for t in self.tickers if t in self._price_cache}
+    
+    def _compute_all_hv(self, tickers, window=30):
+        """Historical vol for the given tickers from one batched download.
+        
+        Same estimator and history period as calculate_historical_vol
+        (annualized std of the last `window` daily log returns). Tickers the
+        batch can't cover fall back to the per-ticker path when scanned; if the
+        whole batch fails, their histories are prefetched concurrently instead.
+        """
+        period = f'{window + 10}d'
+        try:
+            data = yf.download(tickers, period=period, group_by='ticker', threads=True, progress=False)
+        except Exception as e:
+            print(f"  ⚠️  Batched history download failed ({str(e)}); fetching per ticker")
+            _fetch_all(tickers, period=period)
+            return self._hv_cache
+        
+        for ticker in tickers:
+            try:
+                frame = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+                closes = frame['Close'].dropna()
+            except KeyError:
+                continue
+            if len(closes) == 0:
+                continue
+            if len(closes) < window + 1:
+                self._hv_cache[ticker] = 0.20  # Default
+                continue
+            log_returns = np.log(closes / closes.shift()).iloc[-window:]
+            self._hv_cache[ticker] = float(log_returns.std() * np.sqrt(252))
+        return self._hv_cache
+    
     def get_current_price(self, ticker):
-        """Fetch current stock price."""
-        stock = yf.Ticker(ticker)
-        return stock.history(period='1d')['Close'].iloc[-1]
+        """Fetch current stock price (once per ticker per run)."""
+        if ticker not in self._price_cache:
+            stock = yf.Ticker(ticker)
+            # dropna: a NaN close would be saved as null by orjson
+            self._price_cache[ticker] = stock.history(period='1d')['Close'].dropna().iloc[-1]
+        return self._price_cache[ticker]
     
-    def find_option_opportunity(self, ticker):
+    def find_option_opportunity(self, ticker, log=print):
         """
         Find a trading opportunity for a given ticker.
         Returns trade signal if opportunity found, None otherwise.
+        
+        Progress goes through `log` (one string per call) so concurrent scans
+        can buffer their output instead of interleaving it.
         """
-        print(f"\n🔍 Analyzing {ticker}...")
+        log(f"\n🔍 Analyzing {ticker}...")
         
         try:
             stock = yf.Ticker(ticker)
-            current_price = stock.history(period='1d')['Close'].iloc[-1]
+            current_price = self.get_current_price(ticker)
             
             # Get options chain
             expirations = stock.options
             if len(expirations) == 0:
-                print(f"  ⚠️  No options available for {ticker}")
+                log(f"  ⚠️  No options available for {ticker}")
                 return None
             
-            # Find 30-day expiration
+            # Find 30-day expiration (parse all dates in one vectorized call)
             today = pd.Timestamp.now()
-            target_exp = None
-            min_diff = float('inf')
+            dtes = (pd.to_datetime(list(expirations)) - today).days.to_numpy()
+            valid = dtes > 0
             
-            for exp in expirations:
-                exp_date = pd.Timestamp(exp)
-                dte = (exp_date - today).days
-                if abs(dte - 30) < min_diff and dte > 0:
-                    min_diff = abs(dte - 30)
-                    target_exp = exp
-            
-            if target_exp is None:
-                print(f"  ⚠️  No suitable expiration for {ticker}")
+            if not valid.any():
+                log(f"  ⚠️  No suitable expiration for {ticker}")
                 return None
             
-            T = (pd.Timestamp(target_exp) - today).days / 365
-            print(f"  📅 Using expiration: {target_exp} (T={T:.3f} years)")
+            i = int(np.argmin(np.where(valid, np.abs(dtes - self.target_dte), np.inf)))
+            target_exp = expirations[i]
+            T = dtes[i] / 365
+            log(f"  📅 Using expiration: {target_exp} (T={T:.3f} years)")
             
             # Get call options
             chain = stock.option_chain(target_exp)
             calls = chain.calls
             
-            # Filter liquid options
-            liquid_calls = calls[(calls['volume'] > 10) & (calls['bid'] > 0.10)]
+            # Filter to liquid, slightly OTM (5-15%) strikes before any pricing work
+            lo, hi = current_price * self.min_moneyness, current_price * self.max_moneyness
+            liquid_calls = calls[
+                calls['strike'].between(lo, hi) & (calls['volume'] > 10) & (calls['bid'] > 0.10)
+            ]
             
             if len(liquid_calls) == 0:
-                print(f"  ⚠️  No liquid options for {ticker}")
+                log(f"  ⚠️  No liquid OTM options for {ticker}")
                 return None
             
             # Calculate historical volatility
-            hist_vol = calculate_historical_vol(ticker, window=30)
-            print(f"  📊 Historical Vol: {hist_vol:.2%}")
+            hist_vol = self._hv_cache.get(ticker)
+            if hist_vol is None:
+                hist_vol = calculate_historical_vol(ticker, window=30)
+            log(f"  📊 Historical Vol: {hist_vol:.2%}")
             
-            # Analyze each option
-            best_opportunity = None
-            best_edge = 0
+            # Score the whole chain at once instead of row by row
+            strikes = liquid_calls['strike'].to_numpy()
+            moneyness = strikes / current_price
+            market_price = ((liquid_calls['bid'] + liquid_calls['ask']) / 2).to_numpy()
+            if 'impliedVolatility' in liquid_calls:
+                iv = liquid_calls['impliedVolatility'].to_numpy()
+            else:
+                iv = np.full(len(liquid_calls), hist_vol * 1.1)
             
-            for idx, row in liquid_calls.iterrows():
-                K = row['strike']
-                moneyness = K / current_price
-                
-                # Focus on slightly OTM options (5-15% OTM)
-                if moneyness < 1.05 or moneyness > 1.15:
-                    continue
-                
-                market_price = (row['bid'] + row['ask']) / 2
-                iv = row.get('impliedVolatility', hist_vol * 1.1)
-                
-                # Calculate theoretical price
-                theo_price = black_scholes(current_price, K, T, self.r, hist_vol, 'call')
-                
-                # Check for edge
-                iv_edge = iv - hist_vol
-                price_edge_pct = (market_price - theo_price) / theo_price if theo_price > 0 else 0
-                
-                # SELL criteria: IV > HV + 3% AND price > theo + 5%
-                if iv_edge > 0.03 and price_edge_pct > 0.05:
-                    edge = market_price - theo_price
-                    
-                    if edge > best_edge:
-                        best_edge = edge
-                        best_opportunity = {
-                            'ticker': ticker,
-                            'action': 'SELL',
-                            'strike': K,
-                            'expiration': target_exp,
-                            'price': row['bid'],  # Sell at bid
-                            'market_mid': market_price,
-                            'theoretical': theo_price,
-                            'iv': iv,
-                            'hv': hist_vol,
-                            'iv_edge': iv_edge,
-                            'price_edge': edge,
-                            'price_edge_pct': price_edge_pct,
-                            'moneyness': moneyness,
-                            'current_stock_price': current_price,
-                            'T': T
-                        }
+            # Calculate theoretical prices for every strike in one call
+            theo_price = black_scholes(current_price, strikes, T, self.r, hist_vol, 'call')
+            
+            # Check for edge
+            iv_edge = iv - hist_vol
+            edge = market_price - theo_price
+            with np.errstate(divide='ignore', invalid='ignore'):
+                price_edge_pct = np.where(theo_price > 0, edge / theo_price, 0)
+            
+            # SELL criteria: IV > HV + 3% AND price > theo + 5%
+            candidates = (iv_edge > 0.03) & (price_edge_pct > 0.05)
+            
+            best_opportunity = None
+            if candidates.any():
+                # Largest edge wins (first one on ties, as before)
+                i = np.flatnonzero(candidates)[np.argmax(edge[candidates])]
+                best_opportunity = {
+                    'ticker': ticker,
+                    'action': 'SELL',
+                    'strike': strikes[i],
+                    'expiration': target_exp,
+                    'price': liquid_calls['bid'].iloc[i],  # Sell at bid
+                    'market_mid': market_price[i],
+                    'theoretical': theo_price[i],
+                    'iv': iv[i],
+                    'hv': hist_vol,
+                    'iv_edge': iv_edge[i],
+                    'price_edge': edge[i],
+                    'price_edge_pct': price_edge_pct[i],
+                    'moneyness': moneyness[i],
+                    'current_stock_price': current_price,
+                    'T': T
+                }
             
             if best_opportunity:
-                print(f"  ✅ FOUND OPPORTUNITY!")
-                print(f"     Strike: ${best_opportunity['strike']:.0f} ({best_opportunity['moneyness']:.1%} moneyness)")
-                print(f"     Price: ${best_opportunity['price']:.2f} (Theo: ${best_opportunity['theoretical']:.2f})")
-                print(f"     IV: {best_opportunity['iv']:.1%} vs HV: {best_opportunity['hv']:.1%}")
-                print(f"     Edge: ${best_opportunity['price_edge']:.2f} ({best_opportunity['price_edge_pct']:.1%})")
+                log(f"  ✅ FOUND OPPORTUNITY!")
+                log(f"     Strike: ${best_opportunity['strike']:.0f} ({best_opportunity['moneyness']:.1%} moneyness)")
+                log(f"     Price: ${best_opportunity['price']:.2f} (Theo: ${best_opportunity['theoretical']:.2f})")
+                log(f"     IV: {best_opportunity['iv']:.1%} vs HV: {best_opportunity['hv']:.1%}")
+                log(f"     Edge: ${best_opportunity['price_edge']:.2f} ({best_opportunity['price_edge_pct']:.1%})")
                 return best_opportunity
             else:
-                print(f"  ❌ No opportunities meeting criteria")
+                log(f"  ❌ No opportunities meeting criteria")
                 return None
                 
         except Exception as e:
-            print(f"  ❌ Error analyzing {ticker}: {str(e)}")
+            log(f"  ❌ Error analyzing {ticker}: {str(e)}")
             return None
     
     def execute_trade(self, opportunity):
@@ -256,14 +400,10 @@ class PaperTradingPortfolio:
         allocation = self.allocation_per_ticker
         
         # Check for duplicate position (same ticker, strike, expiration)
-        for pos in self.portfolio['positions']:
-            if (pos['ticker'] == ticker and 
-                pos['strike'] == opportunity['strike'] and 
-                pos['expiration'] == opportunity['expiration'] and
-                pos['action'] == opportunity['action']):
-                print(f"  ⏭️  SKIPPING: Duplicate position already exists")
-                print(f"     {ticker} ${opportunity['strike']} {opportunity['expiration']}")
-                return False
+        if self._position_key(opportunity) in self._pos_index:
+            print(f"  ⏭️  SKIPPING: Duplicate position already exists")
+            print(f"     {ticker} ${opportunity['strike']} {opportunity['expiration']}")
+            return False
         
         # Calculate position size - CONSERVATIVE: 2% of allocation
         premium_per_contract = opportunity['price'] * 100
@@ -302,6 +442,8 @@ class PaperTradingPortfolio:
         
         # Add position
         self.portfolio['positions'].append(trade)
+        self._pos_index[self._position_key(trade)] = trade
+        self._ticker_count[ticker] += 1
         
         print(f"\n  ✅ TRADE EXECUTED!")
         print(f"     {opportunity['action']} {contracts}x {ticker} ${opportunity['strike']:.0f} Call")
@@ -318,8 +460,8 @@ class PaperTradingPortfolio:
         new_positions = []
         
         for pos in self.portfolio['positions']:
-            entry_date = datetime.strptime(pos['entry_date'], '%Y-%m-%d')
-            exp_date = datetime.strptime(pos['expiration'], '%Y-%m-%d')
+            entry_date = _parse_date(pos['entry_date'])
+            exp_date = _parse_date(pos['expiration'])
             days_held = (today - entry_date).days
             
             pos['days_held'] = days_held
@@ -339,27 +481,16 @@ class PaperTradingPortfolio:
                     pnl = (intrinsic * pos['contracts'] * 100) - pos['premium_paid']
                 
                 # Update performance stats
-                if 'performance_stats' not in self.portfolio:
-                    self.portfolio['performance_stats'] = {
-                        'total_trades': 0,
-                        'winning_trades': 0,
-                        'losing_trades': 0,
-                        'total_pnl': 0,
-                        'largest_win': 0,
-                        'largest_loss': 0
-                    }
-                
-                self.portfolio['performance_stats']['total_trades'] += 1
-                self.portfolio['performance_stats']['total_pnl'] += pnl
+                stats = self.portfolio['performance_stats']
+                stats['total_trades'] += 1
+                stats['total_pnl'] += pnl
                 
                 if pnl > 0:
-                    self.portfolio['performance_stats']['winning_trades'] += 1
-                    if pnl > self.portfolio['performance_stats']['largest_win']:
-                        self.portfolio['performance_stats']['largest_win'] = pnl
+                    stats['winning_trades'] += 1
+                    stats['largest_win'] = max(stats['largest_win'], pnl)
                 else:
-                    self.portfolio['performance_stats']['losing_trades'] += 1
-                    if pnl < self.portfolio['performance_stats']['largest_loss']:
-                        self.portfolio['performance_stats']['largest_loss'] = pnl
+                    stats['losing_trades'] += 1
+                    stats['largest_loss'] = min(stats['largest_loss'], pnl)
                 
                 pos['exit_date'] = today.strftime('%Y-%m-%d')
                 pos['exit_stock_price'] = current_price
@@ -386,6 +517,7 @@ class PaperTradingPortfolio:
                 new_positions.append(pos)
         
         self.portfolio['positions'] = new_positions
+        self._index_positions()
         print(f"\n  Open positions: {len(self.portfolio['positions'])}")
         print(f"  Closed trades: {len(self.portfolio['closed_trades'])}")
     
@@ -393,36 +525,32 @@ class PaperTradingPortfolio:
         """Record daily portfolio value and benchmarks."""
         today = datetime.now().strftime('%Y-%m-%d')
         
-        # Calculate positions value (mark-to-market)
-        positions_value = 0
-        for pos in self.portfolio['positions']:
-            if pos['action'] == 'SELL':
-                # Liability (we owe the option value)
-                current_price = self.get_current_price(pos['ticker'])
-                days_to_exp = (datetime.strptime(pos['expiration'], '%Y-%m-%d') - datetime.now()).days
-                T = max(days_to_exp / 365, 0.001)
-                option_value = black_scholes(current_price, pos['strike'], T, self.r, pos['entry_iv'], 'call')
-                positions_value -= option_value * pos['contracts'] * 100
-            else:
-                # Asset
-                current_price = self.get_current_price(pos['ticker'])
-                days_to_exp = (datetime.strptime(pos['expiration'], '%Y-%m-%d') - datetime.now()).days
-                T = max(days_to_exp / 365, 0.001)
-                option_value = black_scholes(current_price, pos['strike'], T, self.r, pos['entry_iv'], 'call')
-                positions_value += option_value * pos['contracts'] * 100
+        # Calculate positions value (mark-to-market), pricing all positions in one call
+        now = datetime.now()
+        positions = self.portfolio['positions']
+        S = np.array([self.get_current_price(pos['ticker']) for pos in positions], dtype=float)
+        K = np.array([pos['strike'] for pos in positions], dtype=float)
+        days_to_exp = np.array([(_parse_date(pos['expiration']) - now).days for pos in positions], dtype=float)
+        T = np.maximum(days_to_exp / 365, 0.001)
+        iv = np.array([pos['entry_iv'] for pos in positions], dtype=float)
+        contracts = np.array([pos['contracts'] for pos in positions], dtype=float)
+        # Short options are a liability (we owe the option value), longs an asset
+        sign = np.array([-1.0 if pos['action'] == 'SELL' else 1.0 for pos in positions])
+        
+        option_values = black_scholes(S, K, T, self.r, iv, 'call')
+        positions_value = float(np.sum(option_values * contracts * 100 * sign))
         
         portfolio_value = self.portfolio['current_cash'] + positions_value
         
-        # Update benchmarks
-        benchmarks = {}
-        for ticker in self.tickers:
-            current_price = self.get_current_price(ticker)
-            # Initialize shares if first day
-            if len(self.portfolio['daily_snapshots']) == 1:
-                self.portfolio['benchmark_shares'][ticker] = 250 / current_price
-            
-            shares = self.portfolio['benchmark_shares'][ticker]
-            benchmarks[f'{ticker.lower()}_benchmark'] = shares * current_price
+        # Update benchmarks - shares and prices as arrays aligned with self.tickers
+        prices = np.array([self.get_current_price(ticker) for ticker in self.tickers])
+        # Initialize shares if first day
+        if len(self.portfolio['daily_snapshots']) == 1:
+            self.portfolio['benchmark_shares'].update(zip(self.tickers, (250 / prices).tolist()))
+        
+        shares = np.array([self.portfolio['benchmark_shares'][ticker] for ticker in self.tickers])
+        values = shares * prices
+        benchmarks = {f'{ticker.lower()}_benchmark': v for ticker, v in zip(self.tickers, values)}
         
         snapshot = {
             'date': today,
@@ -434,6 +562,21 @@ class PaperTradingPortfolio:
         
         self.portfolio['daily_snapshots'].append(snapshot)
         
+        # Track running peak and max drawdown incrementally instead of
+        # rescanning the whole history for every report
+        stats = self.portfolio['performance_stats']
+        if 'running_peak' in stats:
+            new_values = [snapshot['portfolio_value']]
+        else:
+            # First run with incremental tracking - seed from existing history
+            new_values = [s['portfolio_value'] for s in self.portfolio['daily_snapshots']]
+            stats['running_peak'] = new_values[0]
+            stats['max_dd'] = 0
+        for v in new_values:
+            stats['running_peak'] = max(stats['running_peak'], v)
+            dd = (v - stats['running_peak']) / stats['running_peak'] * 100
+            stats['max_dd'] = min(stats['max_dd'], dd)
+        
         print(f"\n📊 Daily Snapshot:")
         print(f"   Portfolio Value: ${portfolio_value:,.2f}")
         print(f"   Cash: ${self.portfolio['current_cash']:,.2f}")
@@ -448,14 +591,7 @@ class PaperTradingPortfolio:
         spy_return = (latest['spy_benchmark'] - 250) / 250 * 100
         
         # Performance stats
-        stats = self.portfolio.get('performance_stats', {
-            'total_trades': 0,
-            'winning_trades': 0,
-            'losing_trades': 0,
-            'total_pnl': 0,
-            'largest_win': 0,
-            'largest_loss': 0
-        })
+        stats = self.portfolio['performance_stats']
         
         win_rate = (stats['winning_trades'] / stats['total_trades'] * 100) if stats['total_trades'] > 0 else 0
         
@@ -484,16 +620,8 @@ class PaperTradingPortfolio:
         print()
         print(f"{'RISK METRICS':^70}")
         
-        # Calculate max drawdown
-        values = [s['portfolio_value'] for s in self.portfolio['daily_snapshots']]
-        peak = values[0]
-        max_dd = 0
-        for v in values:
-            if v > peak:
-                peak = v
-            dd = (v - peak) / peak * 100
-            if dd < max_dd:
-                max_dd = dd
+        # Max drawdown is maintained incrementally by update_daily_snapshot
+        max_dd = stats.get('max_dd', 0)
         
         print(f"Max Drawdown: {max_dd:.2f}%")
         print(f"Position Utilization: {len(self.portfolio['positions'])}/{self.max_total_positions} ({len(self.portfolio['positions'])/self.max_total_positions*100:.0f}%)")
@@ -509,9 +637,18 @@ def run_daily_update():
     print(f"🚀 DAILY PAPER TRADING UPDATE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
     
+    # Fresh market data every run (matters when called repeatedly in-process)
+    _get_history.cache_clear()
+    
     # Initialize portfolio
     portfolio = PaperTradingPortfolio()
     
+    # One batched spot download for every ticker instead of one request each
+    try:
+        portfolio._fetch_spots()
+    except Exception as e:
+        print(f"⚠️  Batched price download failed ({str(e)}); fetching per ticker")
+    
     # Step 1: Update existing positions
     portfolio.update_positions()
     
@@ -525,20 +662,38 @@ def run_daily_update():
         print(f"\n⏸️  SKIPPING NEW TRADES: Already at maximum (4/4 positions)")
         print(f"   This prevents over-leverage. Wait for positions to close.")
     else:
+        eligible_tickers = []
         for ticker in portfolio.tickers:
             # Only open 1 position per ticker maximum (was 2 before)
-            ticker_positions = len([p for p in portfolio.portfolio['positions'] if p['ticker'] == ticker])
+            ticker_positions = portfolio._ticker_count[ticker]
             
             if ticker_positions >= 1:
                 print(f"\n⏭️  Skipping {ticker} (already have {ticker_positions} position)")
                 continue
             
+            eligible_tickers.append(ticker)
+        
+        # Historical vol for the tickers we'll scan, from one batched download
+        if eligible_tickers:
+            portfolio._compute_all_hv(eligible_tickers, window=30)
+        
+        # Scan concurrently - options/chain downloads are network-bound.
+        # Each scan buffers its log lines so output stays grouped per ticker.
+        def scan(ticker):
+            lines = []
+            return portfolio.find_option_opportunity(ticker, log=lines.append), lines
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(eligible_tickers))) as pool:
+            scans = list(pool.map(scan, eligible_tickers))
+        
+        # Trade serially so cash accounting stays single-threaded
+        for opportunity, lines in scans:
             # Check if we can still open positions
             if total_open_positions >= 4:
                 print(f"\n⏸️  Reached maximum positions (4), stopping scan")
                 break
             
-            opportunity = portfolio.find_option_opportunity(ticker)
+            print("\n".join(lines))
             
             if opportunity:
                 success = portfolio.execute_trade(opportunity)
@@ -12,6 +12,9 @@ Schedule this to run at 9:35 AM Central Time every weekday
 import subprocess
 import sys
 import os
+import signal
+import threading
+import traceback
 import webbrowser
 import time
 from datetime import datetime
@@ -22,48 +25,83 @@ def log(message):
     timestamp = datetime.now().strftime('%H:%M:%S')
     print(f"[{timestamp}] {message}")
 
+class TradingTimeout(BaseException):
+    """Raised inside the trading run when it exceeds TRADING_TIMEOUT.
+    
+    A BaseException so the backend's `except Exception` handlers can't
+    swallow it.
+    """
+
+TRADING_TIMEOUT = 300  # 5 minutes
+
+def run_with_alarm(func, timeout):
+    """Run func in the main thread, raising TradingTimeout inside it on timeout."""
+    def on_alarm(signum, frame):
+        raise TradingTimeout()
+    
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def run_in_thread(func, timeout):
+    """Fallback without SIGALRM (Windows): run func in a worker thread.
+    
+    A thread can't be cancelled, so after the timeout we keep waiting rather
+    than move on while it could still be writing portfolio_data.json.
+    """
+    outcome = {}
+    
+    def target():
+        try:
+            outcome['result'] = func()
+        except BaseException as e:
+            outcome['error'] = e
+    
+    worker = threading.Thread(target=target)
+    worker.start()
+    worker.join(timeout=timeout)
+    
+    if worker.is_alive():
+        log(f"⚠️  Trading script still running after {timeout // 60} minutes; waiting for it to finish")
+        worker.join()
+    
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('result')
+
 def run_trading_script():
-    """Execute the trading script."""
+    """Execute the trading update in-process, cancelled after 5 minutes."""
     log("🚀 Running trading script...")
     
     try:
-        result = subprocess.run(
-            [sys.executable, 'live_trading_backend.py'],
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        # Print output
-        print(result.stdout)
-        
-        if result.returncode == 0:
-            log("✅ Trading script completed successfully")
-            return True
+        from live_trading_backend import run_daily_update
+        if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+            run_with_alarm(run_daily_update, TRADING_TIMEOUT)
         else:
-            log(f"❌ Trading script failed with code {result.returncode}")
-            print(result.stderr)
-            return False
-            
-    except subprocess.TimeoutExpired:
+            run_in_thread(run_daily_update, TRADING_TIMEOUT)
+    except TradingTimeout:
         log("❌ Trading script timed out after 5 minutes")
         return False
-    except Exception as e:
-        log(f"❌ Error running trading script: {e}")
+    except Exception:
+        log("❌ Trading script failed")
+        print(traceback.format_exc())
         return False
+    
+    log("✅ Trading script completed successfully")
+    return True
 
 def start_dashboard_server(auto_open=True):
     """Start the dashboard server in background."""
     log("🌐 Starting dashboard server...")
     
     try:
-        # Start server as background process
-        process = subprocess.Popen(
-            [sys.executable, 'dashboard_server.py'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        # Start server as background process. It inherits our stdout/stderr:
+        # pipes that nobody reads would fill up and stall the server.
+        process = subprocess.Popen([sys.executable, 'dashboard_server.py'])
         
         # Give it a moment to start
         time.sleep(2)